@@ -1,6 +1,93 @@
 import os
 import sys
-import subprocess
+import json
+import socket
+import struct
+
+# ------------- #
+# Server Client #
+# ------------- #
+
+# the compile server lives in a folder private to the user, anyone can create files in a shared temp folder
+user_id = os.getuid() if hasattr(os, "getuid") else 0
+runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.environ.get("TMPDIR") or "/tmp", f"typy-{user_id}")
+default_socket = os.path.join(runtime_dir, "typy.sock")
+
+def peer_uid(conn: socket.socket) -> int | None:
+    # user on the other end of the socket, only known on Linux
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    _, uid, _ = struct.unpack("3i", conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")))
+    return uid
+
+def send_request(request: dict, socket_path: str = default_socket) -> dict:
+    # only talk to a server run by this user, it sends back code that may be executed
+    if os.stat(socket_path).st_uid != user_id:
+        raise PermissionError(f"[FATAL] {socket_path} is not owned by this user")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+
+        # the socket file could have been swapped after the stat
+        uid = peer_uid(client)
+        if uid is not None and uid != user_id:
+            raise PermissionError(f"[FATAL] {socket_path} is served by another user")
+
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+def fast_client(argv: list[str]) -> bool:
+    # <file.typy> --client [--enforce | --enforce-strict] [--enforce-shallow] [--no-debug | --debug-all] [--socket <path>]
+    # anything else, or no server running, goes through the full compiler
+    args = argv[1:]
+    if not args or not args[0].endswith(".typy") or not os.path.isfile(args[0]):
+        return False
+
+    flags = args[1:]
+    socket_path = default_socket
+    if "--socket" in flags:
+        i = flags.index("--socket")
+        if i + 1 >= len(flags):
+            return False
+        socket_path = flags[i + 1]
+        del flags[i:i + 2]
+
+    # unknown, repeated or conflicting flags are reported by the full compiler
+    if not set(flags) <= {"--client", "--enforce", "--enforce-strict", "--enforce-shallow", "--no-debug", "--debug-all"} or len(set(flags)) != len(flags):
+        return False
+    if {"--enforce", "--enforce-strict"} <= set(flags) or {"--enforce", "--enforce-shallow"} <= set(flags) or {"--no-debug", "--debug-all"} <= set(flags):
+        return False
+
+    request = {
+        "path": os.path.abspath(args[0]),
+        # single files are compiled into the current folder
+        "output": os.path.abspath(os.path.splitext(os.path.basename(args[0]))[0] + ".py"),
+        "enforce": "--enforce" in flags or "--enforce-strict" in flags or "--enforce-shallow" in flags,
+        "strict": "--enforce-strict" in flags,
+        "shallow": "--enforce-shallow" in flags,
+        "debug": 0 if "--no-debug" in flags else 2 if "--debug-all" in flags else 1,
+    }
+
+    try:
+        response = send_request(request, socket_path)
+    except (FileNotFoundError, ConnectionRefusedError, PermissionError):
+        return False
+
+    print(response["diagnostics"], end="")
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return True
+
+# `<file.typy> --client` stops here when a server answers, before importing the rest of the compiler
+if __name__ == "__main__" and "--client" in sys.argv and fast_client(sys.argv):
+    sys.exit(0)
+
+import io
+import time
+from contextlib import redirect_stdout, contextmanager
+from functools import partial, lru_cache
 from pathlib import Path
 import re
 
@@ -19,7 +106,10 @@ assignable_types = customs.types + tuple(
 enforce_text = """
 from functools import wraps
 import inspect
-from typing import get_origin, get_args, Literal, Final, Annotated, Callable
+import reprlib
+import dataclasses
+from types import UnionType
+from typing import get_origin, get_args, get_type_hints, is_typeddict, Literal, Final, Annotated, Callable, Union, Any
 
 def type_str(value) -> str:
     # check if its a type, then it probably can handle .__name__
@@ -69,7 +159,149 @@ def type_str(value) -> str:
     # return the name of the type + () to signify it's a custom type
     return t.__name__ + "()"
 
-def check_type(value, expected, strict):
+# field validators of record classes (dataclass, TypedDict, NamedTuple), compiled once per class
+schema_validators = {}
+schema_missing = object()
+
+def hint_str(hint) -> str:
+    # annotations print as written, plain classes by name
+    if isinstance(hint, type):
+        return hint.__name__
+    return str(hint).replace("typing.", "").replace("collections.abc.", "")
+
+def schema_fail(failure, cls, name, reason) -> bool:
+    # the innermost failing field gives the reason, the records around it only prefix their field name
+    if failure:
+        failure[:1] = [cls.__name__, name]
+    else:
+        failure[:] = [cls.__name__, name, reason]
+    return False
+
+def field_fail(failure, cls, name, expected, value) -> bool:
+    # the value itself shows which element is wrong, type_str only looks at the first one
+    return schema_fail(failure, cls, name, f"expected {hint_str(expected)}, got {reprlib.repr(value)}")
+
+def field_hint(hint):
+    # rewrite a field annotation into one check_type can walk
+    if hint is None or hint is type(None) or hint is Any:
+        return hint
+    if isinstance(hint, tuple):
+        return tuple(field_hint(t) for t in hint)
+
+    origin = get_origin(hint)
+    args = get_args(hint)
+
+    # plain classes, anything else without an origin (TypeVar, NewType, ...) is not checked
+    if origin is None:
+        return hint if isinstance(hint, type) else Any
+
+    if origin in (Union, UnionType):
+        return Union[tuple(field_hint(t) for t in args)]
+    if origin in (list, dict, tuple, set, frozenset):
+        return origin[tuple(t if t is Ellipsis else field_hint(t) for t in args)] if args else origin
+    if origin in (Literal, Final, Annotated):
+        return hint
+
+    # abc generics (Sequence[str], Callable[[int], str], ...), type[...] and user generics only get their outer type checked
+    return origin if isinstance(origin, type) else Any
+
+def schema_validator(cls):
+    # already compiled, None means it's not a record
+    if cls in schema_validators:
+        return schema_validators[cls]
+
+    # resolve the field annotations a single time, forward references included
+    try:
+        hints = get_type_hints(cls)
+
+    # unresolvable forward references, keep the annotations that are already types
+    except Exception:
+        hints = {name: hint for name, hint in getattr(cls, "__annotations__", {}).items() if not isinstance(hint, str)}
+
+    # hints the checker can't walk are narrowed to their outer type, or to Any
+    hints = {name: field_hint(hint) for name, hint in hints.items()}
+
+    # fields typed Any accept everything, so they are not checked at all
+    def fields_to_check(names):
+        return tuple((name, hints[name]) for name in names if name in hints and hints[name] is not Any)
+
+    # TypedDict -> a dict with the required keys, extra keys are allowed
+    if is_typeddict(cls):
+        required = tuple(cls.__required_keys__)
+        checks = fields_to_check(hints)
+
+        def validator(value, check, failure):
+            if not isinstance(value, dict):
+                return False
+            for key in required:
+                if key not in value:
+                    return schema_fail(failure, cls, key, "missing required key")
+            for name, expected in checks:
+                failure.clear()
+                if name in value and not check(value[name], expected):
+                    return field_fail(failure, cls, name, expected, value[name])
+            return True
+
+    # NamedTuple -> fields by position
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        checks = tuple((index, name, expected) for index, (name, expected) in enumerate(
+            (name, hints.get(name, Any)) for name in cls._fields) if expected is not Any)
+
+        def validator(value, check, failure):
+            if not isinstance(value, cls):
+                return False
+            for index, name, expected in checks:
+                failure.clear()
+                if not check(value[index], expected):
+                    return field_fail(failure, cls, name, expected, value[index])
+            return True
+
+    # dataclass -> fields as attributes
+    elif dataclasses.is_dataclass(cls):
+        checks = fields_to_check(field.name for field in dataclasses.fields(cls))
+
+        def validator(value, check, failure):
+            if not isinstance(value, cls):
+                return False
+            for name, expected in checks:
+                field_value = getattr(value, name, schema_missing)
+                if field_value is schema_missing:
+                    return schema_fail(failure, cls, name, "missing field")
+                failure.clear()
+                if not check(field_value, expected):
+                    return field_fail(failure, cls, name, expected, field_value)
+            return True
+
+    else:
+        validator = None
+
+    schema_validators[cls] = validator
+    return validator
+
+def shallow_check(value, expected) -> bool:
+    # only look at the outer type of a field, without walking nested values or records
+    if isinstance(expected, tuple):
+        return any(shallow_check(value, t) for t in expected)
+    if expected is None or expected is type(None):
+        return value is None
+    if expected is Any:
+        return True
+
+    origin = get_origin(expected)
+    if origin in (Union, UnionType):
+        return any(shallow_check(value, t) for t in get_args(expected))
+    if origin in (Literal, Final, Annotated):
+        return True
+    if origin is not None:
+        return isinstance(value, origin)
+    if is_typeddict(expected):
+        return isinstance(value, dict)
+    return isinstance(value, expected)
+
+def check_type(value, expected, strict, shallow=False):
+    # path of the record field that failed, followed by the reason
+    failure = []
+
     # private function to return a boolean if value is of expected type
     def _check_type(value, expected):
         # handle multiple types (<types>)
@@ -82,11 +314,19 @@ def check_type(value, expected, strict):
         # handle None
         if expected is None or expected is type(None):
             return value is None
+
+        # Any accepts everything
+        if expected is Any:
+            return True
         
         # get annotation parts
         origin = get_origin(expected)
         args = get_args(expected)
 
+        # Optional / Union
+        if origin in (Union, UnionType):
+            return any(_check_type(value, t) for t in args)
+
         # List
         if origin is list:
             # if not a list
@@ -150,11 +390,25 @@ def check_type(value, expected, strict):
         if origin in (Literal, Final, Annotated):
             return 2
 
+        # records get their fields checked, shallow mode only looks at the outer type of each field
+        # builtins are never records, so they skip the validator lookup
+        if isinstance(expected, type) and expected.__module__ != "builtins":
+            validator = schema_validator(expected)
+            if validator is not None:
+                return validator(value, shallow_check if shallow else _check_type, failure)
+
         # any other type is attempted to be checked this way
         return isinstance(value, expected)
     
     # fetch bad types
     check_result = _check_type(value, expected)
+
+    # name the record field that failed, if any
+    strict_field = warn_field = ""
+    if not check_result and failure:
+        failed_field = ".".join(failure[:-1]) + ": " + failure[-1]
+        strict_field = f"\\n                 Field -> {failed_field}"
+        warn_field = f"\\n        Field -> {failed_field}"
     
     # if strict mode, raise errors
     if strict:
@@ -170,15 +424,15 @@ def check_type(value, expected, strict):
             # make some types prettier
             if len(final_types) == 1:
                 raise TypeError(f"[FATAL] Expected -> {final_types[0]}\\n"
-                     f"                   Got -> {type_str(value)}")
+                     f"                   Got -> {type_str(value)}{strict_field}")
 
             raise TypeError(f"[FATAL] Expected any of {final_types}\\n"
-                 f"                   Got -> {type_str(value)}")
+                 f"                   Got -> {type_str(value)}{strict_field}")
         
         # if single type
         elif not check_result:
             raise TypeError(f"[FATAL] Expected -> {type_str(expected)}\\n"
-                 f"                   Got -> {type_str(value)}")
+                 f"                   Got -> {type_str(value)}{strict_field}")
     
     # if not strict mode, just warn
     else:
@@ -194,17 +448,17 @@ def check_type(value, expected, strict):
             # make some types prettier
             if len(final_types) == 1:
                 print(f"\\n[WARNING] Expected -> {final_types[0]}\\n"
-                        f"          Got -> {type_str(value)}")
+                        f"          Got -> {type_str(value)}{warn_field}")
 
             print(f"\\n[WARNING] Expected any of {final_types}\\n"
-                    f"          Got -> {type_str(value)}")
+                    f"          Got -> {type_str(value)}{warn_field}")
         
         # if single type
         elif not check_result:
             print(f"\\n[WARNING] Expected -> {type_str(expected)}\\n"
-                    f"          Got -> {type_str(value)}")
+                    f"          Got -> {type_str(value)}{warn_field}")
 
-def enforce_types(func=None, *, strict) -> object:
+def enforce_types(func=None, *, strict, shallow=False) -> object:
     def decorator(func) -> object:
         # fetch the signature
         sig = inspect.signature(func)
@@ -239,7 +493,7 @@ def enforce_types(func=None, *, strict) -> object:
                             continue
                     
                     # else check the type normally
-                    check_type(value, expected_type, strict)
+                    check_type(value, expected_type, strict, shallow)
             
             # run func
             result = func(*args, **kwargs)
@@ -247,7 +501,7 @@ def enforce_types(func=None, *, strict) -> object:
             # check annotations
             if 'return' in annotations:
                 expected_return = annotations['return']
-                check_type(result, expected_return, strict)
+                check_type(result, expected_return, strict, shallow)
     
             return result
     
@@ -410,16 +664,22 @@ def split_args(args_str: str) -> list[str]:
 # Typy Compiler #
 # ------------- #
 
-def compile_file(input_path, output_path, enforce, strict) -> None:
-    with open(input_path, "r") as f:
-        lines = f.readlines()
-
-    print(f"[NEW FILE] -> {input_path}")
-
+def compile_lines(lines: list[str], enforce: bool, strict: bool, stats: dict | None = None,
+                  origins: list[int] | None = None, shallow: bool = False) -> list[str] | None:
     py_lines = []
 
+    # counters for --metrics, filled in place
+    if stats is None:
+        stats = {}
+    stats.update(lines=len(lines), functions=0, variables=0, protected_lines=0, skipped_lines=0, checks=0, protected_file=False)
+
     is_protected = 0
+    protection_kind = "protected_lines"
     for i, line in enumerate(lines, start=1):
+        # map the lines emitted by the previous line back to it, used by --check
+        if origins is not None:
+            origins.extend([i - 1] * (len(py_lines) - len(origins)))
+
         # print line info
         print(f"[{i}/{len(lines)}] ", end="")
 
@@ -451,7 +711,8 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
                     if appended.strip():
                         print(debug_indent + f"[WARNING] -> File Protection should be declared as your first line")
             else: print(f"Skipping File")
-            return
+            stats["protected_file"] = True
+            return None
 
 
         # start protecting (until stopped)
@@ -462,6 +723,7 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
 
             # make it infinite
             is_protected = -1
+            protection_kind = "protected_lines"
 
             if debug: print(f"[PROTECTION] -> Started Block")
             else: print(f"Done")
@@ -485,6 +747,7 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
 
             # make it one line
             is_protected = 1
+            protection_kind = "skipped_lines"
             continue
 
         # protect N number of lines from compilation
@@ -505,11 +768,13 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
             else: print("Done")
 
             is_protected = protection_duration
+            protection_kind = "protected_lines"
             continue
 
         # check if line is protected
         if is_protected:
             is_protected -= 1
+            stats[protection_kind] += 1
             if debug: print(f"[PROTECTED] -> {line}")
             else: print("Done")
             py_lines.append(line_expanded)
@@ -558,7 +823,12 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
 
                 # add type enforcement if necessary
                 if enforce:
-                    py_lines.append(" " * indent + f"@enforce_types(strict={strict})")
+                    py_lines.append(" " * indent + f"@enforce_types(strict={strict}{', shallow=True' * shallow})")
+
+                    # the decorator checks every typed argument and the return value
+                    typed_args = [arg for arg in split_args(args_str) if arg.strip() and arg.strip() not in ("self", "cls")]
+                    stats["checks"] += len(typed_args) + 1
+                stats["functions"] += 1
 
                 # build the function line
                 py_lines.append(" " * indent + f"def {name}({args_code}) -> {ret_type}:" + f"{" " + comment if comment else ""}")
@@ -604,8 +874,10 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
 
                 typ_str = (typ if typ != "void" else "None").strip()
 
-                py_lines.append(" " * indent + f"{var}: {typ_str} = {val.strip()}" + f"; check_type({var}, {typ_str}, {strict})" * enforce + f"{" #" + comment if comment != "None" else ""}")
-                if debug: print(debug_indent * debug_all + f"[COMPILED] -> {var}: {typ_str} = {val.strip()}" + f"; check_type({var}, {typ_str}, {strict})" * enforce + f"{" #" + comment if comment != "None" else ""}")
+                py_lines.append(" " * indent + f"{var}: {typ_str} = {val.strip()}" + f"; check_type({var}, {typ_str}, {strict}{', True' * shallow})" * enforce + f"{" #" + comment if comment != "None" else ""}")
+                stats["checks"] += enforce
+                stats["variables"] += 1
+                if debug: print(debug_indent * debug_all + f"[COMPILED] -> {var}: {typ_str} = {val.strip()}" + f"; check_type({var}, {typ_str}, {strict}{', True' * shallow})" * enforce + f"{" #" + comment if comment != "None" else ""}")
                 else: print("Done")
                 continue
 
@@ -614,39 +886,1114 @@ def compile_file(input_path, output_path, enforce, strict) -> None:
         if debug: print(f"[NO CHANGE] -> {line}")
         else: print("Done")
 
+    # map the lines emitted by the last line
+    if origins is not None:
+        origins.extend([len(lines)] * (len(py_lines) - len(origins)))
+
+    return py_lines
+
+def build_code(py_lines: list[str], enforce: bool) -> str:
+    # prepend enforcement machinery if compiling with enforce
+    return enforce_text * enforce + "".join(f"{line}\n" for line in py_lines)
+
+def compile_file(input_path, output_path, enforce, strict, metrics: dict | None = None, shallow: bool = False) -> str | None:
+    # phase timings for --metrics, filled in place
+    if metrics is None:
+        metrics = {}
+    metrics.update(file=str(input_path), read_time=0.0, transform_time=0.0, write_time=0.0, output_size=0)
+
+    start = time.perf_counter()
+    with open(input_path, "r") as f:
+        lines = f.readlines()
+    metrics["read_time"] = time.perf_counter() - start
+
+    print(f"[NEW FILE] -> {input_path}")
+
+    start = time.perf_counter()
+    py_lines = compile_lines(lines, enforce, strict, stats=metrics, shallow=shallow)
+    code = None if py_lines is None else build_code(py_lines, enforce)
+    metrics["transform_time"] = time.perf_counter() - start
+
+    # protected files are left untouched
+    if code is None:
+        return None
+
     # flush to output file
     print(f"\n[PUSHING TO FILE] -> {output_path}")
-
-    # load file
+    start = time.perf_counter()
     with open(output_path, "w") as f:
-        # prepend enforcement machinery if compiling with enforce
-        if enforce:
-            f.write(enforce_text)
-        for i, line in enumerate(py_lines, start=1):
-            print(f"{i}/{len(py_lines)} ({i/len(py_lines)*100:.2f}%)\r", end="")
-            f.write(f"{line}\n")
+        f.write(code)
+    metrics["write_time"] = time.perf_counter() - start
+
+    # bytes on disk, write() counts characters
+    metrics["output_size"] = os.path.getsize(output_path)
     print(f"[COMPILATION SUCCESSFUL]\n")
 
+    return code
+
+# ---------- #
+# Watch Mode #
+# ---------- #
+
+def build_output_path(file: Path, input_path: Path, output_path: Path) -> Path:
+    # mirror the input tree into the output tree
+    relative = file.relative_to(input_path)
+    out_file = output_path / relative.with_suffix(".py")
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    return out_file
+
+# folders never walked by the watcher, on top of hidden ones (.git, .venv, ...)
+watch_skipped_dirs = ("__pycache__", "node_modules", "site-packages")
+
+def scan_folder(folder: str, skipped: frozenset[str] = frozenset()) -> tuple[int, dict[str, tuple[int, int]], list[str]] | None:
+    # mtime of the folder, mtime and size of its .typy files and its sub folders, without going deeper
+    try:
+        mtime = os.stat(folder).st_mtime_ns
+        entries = os.scandir(folder)
+    except (FileNotFoundError, NotADirectoryError):
+        # the folder was removed in the meantime
+        return None
+
+    files, subfolders = {}, []
+
+    # scandir reuses the directory entries, so no Path objects or extra lookups per file
+    with entries:
+        for entry in entries:
+            try:
+                # without following links to avoid cycles
+                if entry.is_dir(follow_symlinks=False):
+                    # skip hidden, excluded and output folders, matched by name or full path
+                    if not (entry.name.startswith(".") or entry.name in skipped or entry.path in skipped):
+                        subfolders.append(entry.path)
+
+                elif entry.name.endswith(".typy") and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+            # the file was removed between listing and stat
+            except FileNotFoundError:
+                continue
+
+    return mtime, files, subfolders
+
+def walk_folders(root: str, folders: dict, snapshot: dict, changed: list[str],
+                 skipped: frozenset[str] = frozenset()) -> None:
+    # add root and every folder under it to folders, their .typy files to snapshot and changed
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        scanned = scan_folder(folder, skipped)
+        if scanned is None:
+            continue
+
+        mtime, files, subfolders = scanned
+        folders[folder] = (mtime, set(files), subfolders)
+        snapshot.update(files)
+        changed.extend(files)
+        stack.extend(subfolders)
+
+def drop_folders(root: str, folders: dict, snapshot: dict, removed: list[str]) -> None:
+    # forget root and every folder under it, their .typy files go to removed
+    stack = [root]
+    while stack:
+        _, files, subfolders = folders.pop(stack.pop())
+        for file in files:
+            snapshot.pop(file, None)
+        removed.extend(files)
+        stack.extend(folder for folder in subfolders if folder in folders)
+
+def rescan_folders(folders: dict, snapshot: dict, changed: list[str], removed: list[str],
+                   skipped: frozenset[str] = frozenset()) -> None:
+    # adding, removing or renaming an entry changes the mtime of its folder, only list those again
+    for folder in list(folders):
+        # dropped along with its parent
+        if folder not in folders:
+            continue
+
+        old_mtime, old_files, old_subfolders = folders[folder]
+        try:
+            if os.stat(folder).st_mtime_ns == old_mtime:
+                continue
+        except FileNotFoundError:
+            pass
+
+        scanned = scan_folder(folder, skipped)
+        if scanned is None:
+            drop_folders(folder, folders, snapshot, removed)
+            continue
+
+        mtime, files, subfolders = scanned
+        folders[folder] = (mtime, set(files), subfolders)
+        for file in old_files - files.keys():
+            snapshot.pop(file, None)
+            removed.append(file)
+        for file, state in files.items():
+            if snapshot.get(file) != state:
+                snapshot[file] = state
+                changed.append(file)
+
+        # new sub folders are walked whole, removed ones are forgotten whole
+        for subfolder in set(old_subfolders) - set(subfolders):
+            if subfolder in folders:
+                drop_folders(subfolder, folders, snapshot, removed)
+        for subfolder in subfolders:
+            if subfolder not in folders:
+                walk_folders(subfolder, folders, snapshot, changed, skipped)
+
+def stat_file(file: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(file)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def restat_files(files, snapshot: dict, changed: list[str]) -> None:
+    # saving a file in place only changes the file itself, not its folder
+    for file in files:
+        state = stat_file(file)
+
+        # a removed file is reported by its folder
+        if state is not None and file in snapshot and snapshot[file] != state:
+            snapshot[file] = state
+            changed.append(file)
+
+def watch_compiler(input_path: Path, output_path: Path, enforce: bool, strict: bool, interval: float = 0.02,
+                   exclude: tuple[str, ...] = (), compile_one=compile_file, sweep_time: float = 1.0,
+                   hot_files: int = 256) -> None:
+    skipped = set(watch_skipped_dirs + exclude)
+
+    # an output tree nested in the input tree only holds .py files, don't walk it
+    if output_path != input_path and output_path.is_relative_to(input_path):
+        skipped.add(str(output_path))
+    skipped = frozenset(skipped)
+
+    # decided once, the watched file may be missing for a moment while an editor saves it
+    single_file = input_path.is_file()
+    if single_file:
+        single_out = input_path.with_suffix(".py").name
+
+    # the first build was already done by start_compiler, only look at changes from now on
+    folders, snapshot = {}, {}
+    if single_file:
+        state = stat_file(str(input_path))
+        snapshot = {str(input_path): state} if state else {}
+    else:
+        walk_folders(str(input_path), folders, snapshot, [], skipped)
+    print(f"[WATCHING] -> {input_path} ({len(snapshot)} files)")
+
+    # recently changed files are looked at on every poll, the others a slice at a time
+    hot = {}
+    sweep_files, sweep = list(snapshot), 0
+
+    try:
+        while True:
+            poll_start = time.perf_counter()
+            changed, removed = [], []
+
+            if single_file:
+                state = stat_file(str(input_path))
+                if state is None and snapshot:
+                    removed.append(str(input_path))
+                elif state is not None and snapshot.get(str(input_path)) != state:
+                    changed.append(str(input_path))
+                snapshot = {str(input_path): state} if state else {}
+            else:
+                rescan_folders(folders, snapshot, changed, removed, skipped)
+                restat_files(hot, snapshot, changed)
+
+                # every file is looked at once per sweep_time
+                if sweep >= len(snapshot):
+                    sweep_files = list(snapshot)
+                    sweep = 0
+                size = max(1, int(len(sweep_files) * interval / sweep_time))
+                restat_files(sweep_files[sweep:sweep + size], snapshot, changed)
+                sweep += size
+
+            # changed or added files
+            for file in changed:
+                # keep the most recently changed files hot
+                hot.pop(file, None)
+                hot[file] = None
+                if len(hot) > hot_files:
+                    del hot[next(iter(hot))]
+
+                file = Path(file)
+                out_file = single_out if single_file else build_output_path(file, input_path, output_path)
+
+                print(f"[CHANGED] -> {file}")
+                start = time.perf_counter()
+
+                # a broken file should not stop the watcher
+                try:
+                    compile_one(file, out_file, enforce, strict)
+                except Exception as error:
+                    print(f"[FAILED] -> {file}\n{error}\n")
+                    continue
+
+                print(f"[RECOMPILED] -> {file} in {(time.perf_counter() - start) * 1000:.2f}ms\n")
+
+            # removed files, drop their output as well
+            for file in removed:
+                hot.pop(file, None)
+                file = Path(file)
+                if single_file:
+                    out_file = Path(single_out)
+                else:
+                    out_file = output_path / file.relative_to(input_path).with_suffix(".py")
+
+                out_file.unlink(missing_ok=True)
+                print(f"[REMOVED] -> {file}\n")
+
+            # the interval counts from the start of the poll, not from its end
+            time.sleep(max(0.0, interval - (time.perf_counter() - poll_start)))
+
+    except KeyboardInterrupt:
+        print(f"\n[STOPPED WATCHING]")
+
+# -------------- #
+# Compile Server #
+# -------------- #
+
+def handle_request(request: dict) -> dict:
+    global debug, debug_all
+
+    # use the debug level of the client, not the one of the server
+    level = request.get("debug", 0)
+    debug, debug_all = level > 0, level > 1
+
+    # strict and shallow always imply enforce
+    strict = bool(request.get("strict", False))
+    shallow = bool(request.get("shallow", False))
+    enforce = bool(request.get("enforce", False)) or strict or shallow
+
+    # phase timings and counters, same as compile_file
+    metrics = {"file": request.get("path"), "read_time": 0.0, "transform_time": 0.0, "write_time": 0.0, "output_size": 0}
+
+    # capture the debug trees so they can be sent back as diagnostics
+    diagnostics = io.StringIO()
+    try:
+        with redirect_stdout(diagnostics):
+            # source text takes priority over the path
+            start = time.perf_counter()
+            if request.get("source") is not None:
+                lines = request["source"].splitlines(keepends=True)
+            else:
+                with open(request["path"], "r") as f:
+                    lines = f.readlines()
+                print(f"[NEW FILE] -> {request['path']}")
+            metrics["read_time"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            py_lines = compile_lines(lines, enforce, strict, stats=metrics, shallow=shallow)
+            code = None if py_lines is None else build_code(py_lines, enforce)
+            metrics["transform_time"] = time.perf_counter() - start
+
+            # protected files are left untouched
+            if code is not None:
+                # write the output if a target was given
+                if request.get("output"):
+                    print(f"\n[PUSHING TO FILE] -> {request['output']}")
+                    start = time.perf_counter()
+                    with open(request["output"], "w") as f:
+                        f.write(code)
+                    metrics["write_time"] = time.perf_counter() - start
+
+                    # bytes on disk, write() counts characters
+                    metrics["output_size"] = os.path.getsize(request["output"])
+
+                print(f"[COMPILATION SUCCESSFUL]\n")
+
+    except Exception as error:
+        return {"ok": False, "code": None, "diagnostics": diagnostics.getvalue(), "error": str(error), "metrics": metrics}
+
+    return {"ok": True, "code": code, "diagnostics": diagnostics.getvalue(), "error": None, "metrics": metrics}
+
+def start_server(socket_path: str = default_socket) -> None:
+    import socketserver
+
+    class CompileHandler(socketserver.StreamRequestHandler):
+        # a client that stays connected without sending anything is dropped
+        timeout = 60
+
+        def handle(self) -> None:
+            # other users would compile and write files as this one
+            uid = peer_uid(self.connection)
+            if uid is not None and uid != user_id:
+                return
+
+            # one json request per line, one json response per line
+            try:
+                for raw in self.rfile:
+                    try:
+                        request = json.loads(raw)
+                    except json.JSONDecodeError as error:
+                        response = {"ok": False, "code": None, "diagnostics": "", "error": f"[FATAL] Bad request: {error}"}
+                    else:
+                        if isinstance(request, dict):
+                            response = handle_request(request)
+                        else:
+                            response = {"ok": False, "code": None, "diagnostics": "", "error": "[FATAL] Bad request: expected a JSON object"}
+
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+            except TimeoutError:
+                return
+
+    # every connection is served in its own forked process, a client that keeps its connection
+    # open doesn't block the others, and the debug globals and stdout of a request stay its own
+    class CompileServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        # stopping the server doesn't wait for idle clients
+        block_on_close = False
+
+    # the folder of the socket must belong to this user, the default one is created private
+    folder = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    if os.stat(folder).st_uid != user_id:
+        raise PermissionError(f"[FATAL] {folder} is not owned by this user")
+
+    # a socket file may be left behind by a server that died
+    if os.path.lexists(socket_path):
+        if os.lstat(socket_path).st_uid != user_id:
+            raise PermissionError(f"[FATAL] {socket_path} is not owned by this user")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+        else:
+            raise OSError(f"[FATAL] A server is already running on {socket_path}")
+
+    with CompileServer(socket_path, CompileHandler) as server:
+        os.chmod(socket_path, 0o600)
+        print(f"[SERVING] -> {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n[STOPPED SERVER]")
+        finally:
+            Path(socket_path).unlink(missing_ok=True)
+
+def client_compile(input_path, output_path, enforce, strict, metrics: dict | None = None,
+                   socket_path: str = default_socket, shallow: bool = False) -> str | None:
+    # the server has its own working directory, so only send absolute paths
+    request = {
+        "path": str(Path(input_path).resolve()),
+        "output": str(Path(output_path).resolve()),
+        "enforce": enforce,
+        "strict": strict,
+        "shallow": shallow,
+        "debug": debug + debug_all,
+    }
+
+    try:
+        response = send_request(request, socket_path)
+
+    # no server running, or not one of ours, compile in this process instead
+    except (FileNotFoundError, ConnectionRefusedError, PermissionError) as error:
+        if isinstance(error, PermissionError): print(f"[WARNING] -> {error}")
+        if debug: print(f"[NO SERVER] -> Compiling In Process")
+        return compile_file(input_path, output_path, enforce, strict, metrics, shallow)
+
+    if metrics is not None:
+        metrics.update(response["metrics"])
+
+    print(response["diagnostics"], end="")
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+
+    return response["code"]
+
+# ------ #
+# Runner #
+# ------ #
+
+@contextmanager
+def script_context(argv0: str, folder: str):
+    # behave like `python <argv0>`, so sibling modules can be imported, then put everything back
+    saved_argv, saved_path = sys.argv[:], sys.path[:]
+    sys.argv[:] = [argv0]
+    sys.path.insert(0, folder)
+    try:
+        yield
+    finally:
+        sys.argv[:] = saved_argv
+        sys.path[:] = saved_path
+
+def run_code(code: str, out_file, entry_point: str | None = None) -> None:
+    import types
+
+    out_file = Path(out_file).resolve()
+
+    # compile straight from memory, the file name keeps tracebacks pointing at the output
+    code_obj = compile(code, str(out_file), "exec")
+
+    with script_context(str(out_file), str(out_file.parent)):
+        # no entry point, run it as the main script
+        if entry_point is None:
+            module = types.ModuleType("__main__")
+            module.__file__ = str(out_file)
+
+            # swap the main module for the duration of the run, just like runpy
+            main_module = sys.modules["__main__"]
+            sys.modules["__main__"] = module
+            try:
+                exec(code_obj, module.__dict__)
+            finally:
+                sys.modules["__main__"] = main_module
+            return
+
+        # import it as a module, json.typy must not replace the json the compiler and runtime use
+        module = types.ModuleType(out_file.stem)
+        module.__file__ = str(out_file)
+        registered_name = out_file.stem if out_file.stem not in sys.modules else f"__typy_run__.{out_file.stem}"
+        sys.modules[registered_name] = module
+        try:
+            exec(code_obj, module.__dict__)
+
+            # and call the entry point
+            func = getattr(module, entry_point, None)
+            if not callable(func):
+                raise NameError(f"[FATAL] Entry point '{entry_point}' not found in {out_file}")
+            func()
+        finally:
+            sys.modules.pop(registered_name, None)
+
+def run_entry_point(output_path: Path, entry_point: str) -> None:
+    import importlib.util
+
+    # <module>:<function> or just <module>, relative to the output folder
+    module_name, _, func_name = entry_point.partition(":")
+
+    # load it from the output folder, importing it by name would hand back an already loaded json or os
+    base = output_path.joinpath(*module_name.split("."))
+    candidates = [(base.with_name(base.name + ".py"), module_name)]
+    if func_name:
+        candidates.append((base / "__init__.py", module_name))
+    else:
+        candidates.append((base / "__main__.py", f"{module_name}.__main__"))
+
+    found = [(file, name) for file, name in candidates if file.is_file()]
+    if not found:
+        raise ModuleNotFoundError(f"[FATAL] No module named '{module_name}' in {output_path}")
+    file, name = found[0]
+
+    # same naming as run_code, a shadowed name goes under a prefix
+    registered_name = name if name not in sys.modules else f"__typy_run__.{name}"
+    spec = importlib.util.spec_from_file_location(registered_name, file)
+    module = importlib.util.module_from_spec(spec)
+
+    # relative imports still resolve against the real package
+    module.__package__ = module_name if file.name == "__init__.py" else name.rpartition(".")[0]
+
+    loaded = set(sys.modules)
+    with script_context(entry_point, str(output_path)):
+        try:
+            # no function, run the module as the main script
+            if not func_name:
+                code_obj = spec.loader.get_code(spec.name)
+                module.__name__ = "__main__"
+                main_module = sys.modules["__main__"]
+                sys.modules["__main__"] = module
+                try:
+                    exec(code_obj, module.__dict__)
+                finally:
+                    sys.modules["__main__"] = main_module
+                return
+
+            sys.modules[registered_name] = module
+            spec.loader.exec_module(module)
+
+            func = getattr(module, func_name, None)
+            if not callable(func):
+                raise NameError(f"[FATAL] Entry point '{func_name}' not found in {module_name}")
+            func()
+
+        # drop the modules of the run, the next run or the compiler must not see them
+        finally:
+            for loaded_name in set(sys.modules) - loaded:
+                sys.modules.pop(loaded_name, None)
+
+# ---------------- #
+# Production Build #
+# ---------------- #
+
+def compile_pyc(file: str, invalidation_mode) -> str:
+    import py_compile
+
+    # PyCompileError can't be sent back from a worker process, it breaks the whole pool
+    try:
+        return py_compile.compile(file, doraise=True, invalidation_mode=invalidation_mode)
+    except py_compile.PyCompileError as error:
+        raise SyntaxError(f"[FATAL] Can't byte-compile {file}\n{error.msg}") from None
+
+def build_bundle(root: Path, py_files: list[Path], bundle_path, entry_point: str | None = None,
+                 unchecked_hash: bool = False) -> None:
+    import zipfile
+    import py_compile
+    from concurrent.futures import ProcessPoolExecutor
+
+    # unchecked hash pycs are never compared against a source, there is none in the bundle anyway
+    mode = py_compile.PycInvalidationMode.UNCHECKED_HASH if unchecked_hash else py_compile.PycInvalidationMode.TIMESTAMP
+
+    # byte-compile every output in parallel
+    print(f"[BYTE-COMPILING] -> {len(py_files)} files")
+    with ProcessPoolExecutor() as executor:
+        pyc_files = list(executor.map(partial(compile_pyc, invalidation_mode=mode), [str(file) for file in py_files]))
+
+    # pack the bytecode only, stored uncompressed so imports don't pay for inflating
+    print(f"[BUNDLING] -> {bundle_path}")
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_STORED) as bundle:
+        # zipimport needs explicit folder entries to find namespace packages
+        folders = {parent for file in py_files for parent in file.relative_to(root).parents if parent.parts}
+        for folder in sorted(folders, key=lambda folder: len(folder.parts)):
+            bundle.mkdir(folder.as_posix())
+
+        for file, pyc_file in zip(py_files, pyc_files):
+            # zipimport only looks for .pyc files next to where the .py would be, not in __pycache__
+            bundle.write(pyc_file, file.relative_to(root).with_suffix(".pyc").as_posix())
+
+        # <module>:<function> or just <module>, same as --run-here
+        if entry_point:
+            module_name, _, func_name = entry_point.partition(":")
+            if func_name:
+                main_text = f"import sys\nimport {module_name}\nsys.exit({module_name}.{func_name}())\n"
+            else:
+                main_text = f"import runpy\nrunpy.run_module({module_name!r}, run_name=\"__main__\", alter_sys=True)\n"
+            bundle.writestr("__main__.py", main_text)
+
+    print(f"[BUILD SUCCESSFUL] -> {bundle_path}\n")
+
+# ------------ #
+# Type Checker #
+# ------------ #
+
+import ast
+import inspect
+from typing import get_origin
+
+# the runtime checks of enforce builds, loaded once so --check agrees with them
+check_runtime = {}
+
+# annotations are only evaluated when made of these nodes, anything else can't be proven
+annotation_nodes = (ast.Expression, ast.Name, ast.Load, ast.Subscript, ast.Tuple, ast.List, ast.Constant)
+
+@lru_cache(maxsize=None)
+def eval_annotation(annotation: str) -> tuple[bool, object]:
+    # load the runtime on first use
+    if not check_runtime:
+        exec(enforce_text, check_runtime)
+
+    try:
+        tree = ast.parse(annotation, mode="eval")
+    except SyntaxError:
+        return False, None
+
+    if not all(isinstance(node, annotation_nodes) for node in ast.walk(tree)):
+        return False, None
+
+    # only built-in and special types are known, user types raise a NameError
+    namespace = {"__builtins__": {}, "None": None}
+    namespace.update({name: check_runtime[name] for name in ("Literal", "Final", "Annotated", "Callable")})
+    namespace.update({_type.__name__: _type for _type in [
+        int, float, complex, bool, str, list, tuple, set,
+        frozenset, dict, bytes, bytearray, object, memoryview
+    ]})
+
+    try:
+        return True, eval(compile(tree, "<annotation>", "eval"), namespace)
+    except Exception:
+        return False, None
+
+def literal_violates(value, annotation: str, allow_mutable_none: bool = False) -> bool:
+    known, expected = eval_annotation(annotation)
+    if not known:
+        return False
+
+    # None is accepted for mutable arguments, same as enforce_types
+    if allow_mutable_none and value is None:
+        for _type in expected if isinstance(expected, tuple) else (expected,):
+            if (get_origin(_type) or _type) in (list, dict, set, bytearray, memoryview):
+                return False
+
+    try:
+        check_runtime["check_type"](value, expected, True)
+
+    # only the mismatch errors of check_type are proof, anything else is an unsupported annotation
+    except TypeError as error:
+        return str(error).startswith("[FATAL]")
+    except Exception:
+        return False
+
+    return False
+
+def literal_value(node: ast.AST) -> tuple[bool, object]:
+    try:
+        return True, ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False, None
+
+def import_module_name(node: ast.ImportFrom, package: list[str]) -> str:
+    # resolve relative imports against the package of the file
+    if node.level:
+        # above the checked root, keep the dots so it matches no module of the tree
+        if node.level - 1 > len(package):
+            return "." * node.level + (node.module or "")
+        parts = package[:len(package) - node.level + 1]
+        return ".".join(parts + ([node.module] if node.module else []))
+    return node.module or ""
+
+def scope_bindings(nodes: list, package: list[str]) -> dict[str, list[tuple]]:
+    # every way each name is bound directly in a scope, nested scopes excluded
+    bindings = {}
+    other = ("other",)
+
+    def bind(name: str, binding: tuple) -> None:
+        bindings.setdefault(name, []).append(binding)
+
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+
+        # nested functions and classes bind their name here, decorators and defaults run here as well
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            bind(node.name, ("def", node))
+            stack.extend(node.decorator_list + node.args.defaults + [default for default in node.args.kw_defaults if default])
+            continue
+        if isinstance(node, ast.ClassDef):
+            bind(node.name, other)
+            stack.extend(node.decorator_list + node.bases + [keyword.value for keyword in node.keywords])
+            continue
+
+        # lambdas and comprehensions have their own scope, only := leaks out of them
+        if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            for child in ast.walk(node):
+                if isinstance(child, ast.NamedExpr):
+                    bind(child.target.id, other)
+            continue
+
+        # assignments, for / with targets, :=, del
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            bind(node.id, other)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                bind(alias.asname or alias.name, ("import", import_module_name(node, package), alias.name) if alias.name != "*" else other)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                bind(alias.asname or alias.name.split(".")[0], other)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            for name in node.names:
+                bind(name, other)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            bind(node.name, other)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            bind(node.rest, other)
+
+        stack.extend(ast.iter_child_nodes(node))
+
+    return bindings
+
+def argument_names(args: ast.arguments) -> list[str]:
+    return [arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg] if arg]
+
+class CheckVisitor(ast.NodeVisitor):
+    def __init__(self, origins: list[int], package: list[str]):
+        self.origins = origins
+        self.package = package
+        self.scopes = []
+        self.functions = []
+        self.function_ids = {}
+        self.calls = []
+        self.variables = {}
+        self.errors = []
+
+    def line(self, node: ast.AST) -> int:
+        # go back to the .typy line
+        return self.origins[node.lineno - 1] if node.lineno <= len(self.origins) else node.lineno
+
+    def in_scope(self, kind: str, bindings: dict, node: ast.AST, name: str | None = None) -> None:
+        self.scopes.append({"kind": kind, "name": name, "bindings": bindings})
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    def resolve(self, name: str) -> tuple | None:
+        # walk the scopes outwards, like Python does
+        for depth, scope in enumerate(reversed(self.scopes)):
+            # a class body is only visible from the class body itself
+            if scope["kind"] == "class" and depth > 0:
+                continue
+
+            bindings = scope["bindings"].get(name)
+            if bindings is None:
+                # `from x import *` may bind anything
+                if "*" in scope["bindings"]:
+                    return None
+                continue
+
+            # bound more than once, or by anything else than a def or an import, can't be proven
+            if len(bindings) != 1 or bindings[0][0] == "other":
+                return None
+            return bindings[0]
+
+        # built-in or unknown
+        return None
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self.in_scope("module", scope_bindings(node.body, self.package), node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.in_scope("class", scope_bindings(node.body, self.package), node, node.name)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        args = node.args
+        positional = args.posonlyargs + args.args
+
+        # defaults only cover the last positional arguments
+        defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+
+        params = []
+        for arg, kind, default in (
+            [(arg, inspect.Parameter.POSITIONAL_ONLY, default) for arg, default in zip(args.posonlyargs, defaults)]
+            + [(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default) for arg, default in zip(args.args, defaults[len(args.posonlyargs):])]
+            + [(args.vararg, inspect.Parameter.VAR_POSITIONAL, None)] * bool(args.vararg)
+            + [(arg, inspect.Parameter.KEYWORD_ONLY, default) for arg, default in zip(args.kwonlyargs, args.kw_defaults)]
+            + [(args.kwarg, inspect.Parameter.VAR_KEYWORD, None)] * bool(args.kwarg)
+        ):
+            annotation = ast.unparse(arg.annotation) if arg.annotation else None
+            params.append((arg.arg, kind, annotation, default is not None))
+
+            # literal default of a typed argument
+            if annotation and default is not None:
+                is_literal, value = literal_value(default)
+                if is_literal and literal_violates(value, annotation, allow_mutable_none=True):
+                    self.errors.append((self.line(default), f"default of '{arg.arg}' in {node.name}() should be {annotation}, got {value!r}"))
+
+        # methods get self or cls for free, unless static
+        scope = self.scopes[-1]
+        is_method = scope["kind"] == "class"
+        decorators = [decorator.id if isinstance(decorator, ast.Name) else None for decorator in node.decorator_list]
+
+        if any(annotation for _, _, annotation, _ in params):
+            self.function_ids[id(node)] = len(self.functions)
+            self.functions.append({
+                "name": node.name,
+                "cls": scope["name"] if is_method else None,
+                "implicit": int(is_method and "staticmethod" not in decorators),
+                "params": params,
+                # other decorators may change the signature
+                "decorated": any(decorator not in ("staticmethod", "classmethod") for decorator in decorators),
+                # the only binding of its name at module or class level, so it can be reached from outside
+                "exported": scope["bindings"].get(node.name) == [("def", node)],
+            })
+
+        self.in_scope("function", scope_bindings(node.body, self.package) | {name: [("other",)] for name in argument_names(args)}, node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self.in_scope("function", {name: [("other",)] for name in argument_names(node.args)}, node)
+
+    def visit_comprehension_scope(self, node: ast.ListComp | ast.SetComp | ast.DictComp | ast.GeneratorExp) -> None:
+        targets = [
+            child.id
+            for generator in node.generators
+            for child in ast.walk(generator.target)
+            if isinstance(child, ast.Name)
+        ]
+        self.in_scope("function", {name: [("other",)] for name in targets}, node)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_comprehension_scope
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if isinstance(node.target, ast.Name):
+            annotation = ast.unparse(node.annotation)
+
+            # module level variables are checked on reassignment as well
+            if self.scopes[-1]["kind"] == "module":
+                self.variables[node.target.id] = annotation
+
+            if node.value is not None:
+                is_literal, value = literal_value(node.value)
+                if is_literal and literal_violates(value, annotation):
+                    self.errors.append((self.line(node), f"'{node.target.id}' is declared {annotation}, got {value!r}"))
+
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        # only module level, a function may shadow the name
+        if self.scopes[-1]["kind"] == "module":
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in self.variables:
+                    is_literal, value = literal_value(node.value)
+                    if is_literal and literal_violates(value, self.variables[target.id]):
+                        self.errors.append((self.line(node), f"'{target.id}' is declared {self.variables[target.id]}, got {value!r}"))
+
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        target = None
+
+        # f(...) resolves to the def or the import that is the only binding of f in its scope
+        if isinstance(node.func, ast.Name):
+            binding = self.resolve(node.func.id)
+            if binding is not None and binding[0] == "def":
+                target = ("def", id(binding[1]))
+            elif binding is not None:
+                target = binding
+
+        # self.f(...) / cls.f(...) from a method, resolves to a method of the class
+        elif (
+            isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name)
+            and node.func.value.id in ("self", "cls")
+            and len(self.scopes) > 1 and self.scopes[-1]["kind"] == "function" and self.scopes[-2]["kind"] == "class"
+        ):
+            target = ("method", self.scopes[-2]["name"], node.func.attr)
+
+        # unpacked arguments can land anywhere
+        unpacked = any(isinstance(arg, ast.Starred) for arg in node.args) or any(keyword.arg is None for keyword in node.keywords)
+
+        if target and not unpacked:
+            args = [literal_value(arg) for arg in node.args]
+            kwargs = {keyword.arg: literal_value(keyword.value) for keyword in node.keywords}
+
+            # nothing to prove without literals
+            if any(is_literal for is_literal, _ in args + list(kwargs.values())):
+                name = node.func.id if isinstance(node.func, ast.Name) else node.func.attr
+                self.calls.append({"line": self.line(node), "name": name, "target": target, "args": args, "kwargs": kwargs})
+
+        self.generic_visit(node)
+
+def module_name(file: Path, root: Path) -> str:
+    parts = list(file.relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+def check_file(input_path: str, module: str) -> dict:
+    global debug, debug_all
+
+    # workers don't go through the CLI
+    debug = debug_all = False
+
+    result = {"file": input_path, "module": module, "functions": [], "calls": [], "errors": []}
+
+    with open(input_path, "r") as f:
+        lines = f.readlines()
+
+    # reuse the compiler to get plain Python, without enforcement so lines map back 1:1
+    origins = []
+    progress = io.StringIO()
+    try:
+        with redirect_stdout(progress):
+            py_lines = compile_lines(lines, False, False, origins=origins)
+    except Exception as error:
+        # directive lines emit nothing, so take the line from the [<line>/<total>] marker printed before each one
+        markers = re.findall(r"^\[(\d+)/\d+\] ", progress.getvalue(), flags=re.MULTILINE)
+        result["errors"].append((int(markers[-1]) if markers else 0, str(error)))
+        return result
+
+    # protected files are not checked
+    if py_lines is None:
+        return result
+
+    try:
+        # protected lines keep their own line break
+        tree = ast.parse("\n".join(line.rstrip("\n") for line in py_lines), filename=input_path)
+    except SyntaxError as error:
+        line = origins[error.lineno - 1] if error.lineno and error.lineno <= len(origins) else error.lineno
+        result["errors"].append((line or 0, f"invalid syntax: {error.msg}"))
+        return result
+
+    # the package of the file, used by relative imports
+    package = module.split(".") if Path(input_path).stem == "__init__" else module.split(".")[:-1]
+
+    visitor = CheckVisitor(origins, package)
+    visitor.visit(tree)
+
+    # local defs are only worth keeping when they are typed
+    calls = []
+    for call in visitor.calls:
+        if call["target"][0] == "def":
+            if call["target"][1] not in visitor.function_ids:
+                continue
+            call["target"] = ("function", visitor.function_ids[call["target"][1]])
+        calls.append(call)
+
+    result.update(functions=visitor.functions, calls=calls, errors=visitor.errors)
+    return result
+
+def check_calls(results: list[dict], root_name: str) -> list[tuple[str, int, str]]:
+    # symbol table of typed functions across the tree, by exact module name relative to the root,
+    # and under the root folder name as well for trees that are imported as a package
+    by_module = {}
+    for result in results:
+        for module in (result["module"], f"{root_name}.{result['module']}".rstrip(".")):
+            by_module.setdefault(module, []).append(result)
+
+    # methods by name, a subclass anywhere in the tree may override them
+    methods = {}
+    for result in results:
+        for func in result["functions"]:
+            if func["cls"] is not None:
+                methods.setdefault(func["name"], []).append(func)
+
+    errors = []
+    for result in results:
+        for call in result["calls"]:
+            kind, *target = call["target"]
+
+            # a def of this file, already resolved through the scopes
+            if kind == "function":
+                candidates = [result["functions"][target[0]]]
+                implicit = 0
+
+            # a module level def of another file
+            elif kind == "import":
+                module, name = target
+                candidates = [
+                    func
+                    for other in by_module.get(module, [])
+                    for func in other["functions"]
+                    if func["name"] == name and func["cls"] is None and func["exported"]
+                ]
+                implicit = 0
+
+            # self.f(...), only when a single class of the tree defines f
+            else:
+                cls, name = target
+                candidates = methods.get(name, [])
+                if len(candidates) != 1 or candidates[0]["cls"] != cls or not candidates[0]["exported"]:
+                    continue
+                implicit = candidates[0]["implicit"]
+
+            # not found, defined more than once in different ways, or reshaped by a decorator
+            signatures = {tuple(func["params"]) for func in candidates}
+            if len(signatures) != 1 or any(func["decorated"] for func in candidates):
+                continue
+            params = signatures.pop()[implicit:]
+
+            signature = inspect.Signature([
+                inspect.Parameter(name, kind, default=None if has_default else inspect.Parameter.empty)
+                for name, kind, _, has_default in params
+            ])
+
+            # bind placeholders, ints for positional and strs for keyword arguments
+            try:
+                bound = signature.bind(*range(len(call["args"])), **{name: name for name in call["kwargs"]})
+            except TypeError:
+                continue
+
+            annotations = {name: (kind, annotation) for name, kind, annotation, _ in params}
+            for name, placeholder in bound.arguments.items():
+                kind, annotation = annotations[name]
+                if not annotation or kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+                    continue
+
+                is_literal, value = call["args"][placeholder] if isinstance(placeholder, int) else call["kwargs"][placeholder]
+                if is_literal and literal_violates(value, annotation, allow_mutable_none=True):
+                    errors.append((result["file"], call["line"], f"argument '{name}' of {call['name']}() should be {annotation}, got {value!r}"))
+
+    return errors
+
+def check_tree(input_path: Path, files: list[Path]) -> int:
+    from concurrent.futures import ProcessPoolExecutor
+
+    root = input_path if input_path.is_dir() else input_path.parent
+    paths = [str(file) for file in files]
+    modules = [module_name(file, root) for file in files]
+
+    print(f"[CHECKING] -> {len(files)} files")
+
+    # parse and check every file in parallel, only calls need the whole tree
+    if len(files) > 1:
+        chunksize = max(1, len(files) // ((os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(check_file, paths, modules, chunksize=chunksize))
+    else:
+        results = [check_file(path, module) for path, module in zip(paths, modules)]
+
+    errors = [(result["file"], line, message) for result in results for line, message in result["errors"]]
+    errors += check_calls(results, root.name)
+
+    for file, line, message in sorted(errors, key=lambda error: (error[0], error[1])):
+        print(f"[TYPE ERROR] -> {file}:{line}")
+        print(f"└─ {message}")
+
+    if errors:
+        print(f"\n[CHECK FAILED] -> {len(errors)} errors in {len({error[0] for error in errors})} files\n")
+    else:
+        print(f"\n[CHECK PASSED] -> {len(files)} files\n")
+
+    return len(errors)
+
 # --------- #
 # Main Loop #
 #---------- #
 
-def start_compiler(input_path: str, output_path: str, enforce: bool, strict: bool):
+def write_metrics(metrics_path, files_metrics: list[dict], build_time: float) -> None:
+    # sum up every per file counter into the build totals
+    build = {"files": len(files_metrics), "wall_time": build_time}
+    for key in ("read_time", "transform_time", "write_time", "lines", "functions", "variables",
+                "protected_lines", "skipped_lines", "checks", "output_size", "protected_file"):
+        build[key if key != "protected_file" else "protected_files"] = sum(m.get(key, 0) for m in files_metrics)
+
+    with open(metrics_path, "w") as f:
+        json.dump({"build": build, "files": files_metrics}, f, indent=4)
+
+    print(f"[METRICS] -> {metrics_path}")
+
+def start_compiler(input_path: str, output_path: str, enforce: bool, strict: bool, watch: bool = False,
+                   socket_path: str | None = None, metrics_path: str | None = None, bundle_path: str | None = None,
+                   bundle_entry: str | None = None, unchecked_hash: bool = False, check: bool = False,
+                   watch_exclude: tuple[str, ...] = (), bundle_py: bool = False, shallow: bool = False):
     # build paths
     input_path = Path(input_path).resolve()
     output_path = Path(output_path).resolve()
 
+    # only look for type errors, nothing is written
+    if check:
+        if input_path.is_file() and input_path.suffix == ".typy":
+            files = [input_path]
+        elif input_path.is_dir():
+            files = list(input_path.rglob("*.typy"))
+        else:
+            raise FileNotFoundError(f"[FATAL] {input_path} is not a .typy file or folder")
+
+        # fail the process so CI can gate on it
+        if check_tree(input_path, files):
+            sys.exit(1)
+        return
+
+    # go through the compile server if asked to
+    if socket_path is None:
+        compile_one = partial(compile_file, shallow=shallow)
+    else:
+        compile_one = partial(client_compile, socket_path=socket_path, shallow=shallow)
+
+    # a broken file should not stop --watch before it starts, same as in the loop
+    def build_one(file, out_file, metrics: dict) -> str | None:
+        try:
+            return compile_one(file, out_file, enforce, strict, metrics)
+        except Exception as error:
+            if not watch:
+                raise
+            print(f"[FAILED] -> {file}\n{error}\n")
+            return None
+
+    files_metrics = []
+    build_start = time.perf_counter()
+
+    # outputs written by this build, protected files have none
+    out_files = []
+
     # if single file
     if input_path.is_file() and input_path.suffix == ".typy":
         # build file path
         out_file = input_path.with_suffix(".py").name
 
         # compile
-        compile_file(input_path, out_file, enforce=enforce)
-
-        # if asked to run
-        if run_file:
-            subprocess.run(["python", out_file])
+        files_metrics.append({})
+        code = build_one(input_path, out_file, files_metrics[-1])
+        if code is not None:
+            out_files.append(Path(out_file).resolve())
 
     # if directory
     elif input_path.is_dir():
@@ -657,38 +2004,109 @@ def start_compiler(input_path: str, output_path: str, enforce: bool, strict: boo
         # loop through files
         for idx, file in enumerate(files, 1):
             # build file path
-            relative = file.relative_to(input_path)
-            out_file = output_path / relative.with_suffix(".py")
-            out_file.parent.mkdir(parents=True, exist_ok=True)
+            out_file = build_output_path(file, input_path, output_path)
 
             # compile
             print(f"[FILE PROGRESS] -> {idx}/{total} ({idx/total*100:.2f}%)")
-            compile_file(file, out_file, enforce, strict)
-
-        # if asked to run and have an entry point
-        if run_file and entry_point:
-            subprocess.run(["python", entry_point])
+            files_metrics.append({})
+            if build_one(file, out_file, files_metrics[-1]) is not None:
+                out_files.append(out_file)
 
     # if we can't build a valid path
     else:
         raise FileNotFoundError(f"[FATAL] {input_path} is not a .typy file or folder")
 
+    # dump the build report before running anything
+    if metrics_path:
+        write_metrics(metrics_path, files_metrics, time.perf_counter() - build_start)
+
+    # production build, bytecode only in a single archive
+    if bundle_path:
+        if input_path.is_file():
+            # a bare function name points into the compiled file itself
+            if bundle_entry and ":" not in bundle_entry:
+                bundle_entry = f"{input_path.stem}:{bundle_entry}"
+            if code is None:
+                raise FileNotFoundError(f"[FATAL] {input_path} is protected, nothing to build")
+            build_bundle(Path.cwd(), out_files, bundle_path, bundle_entry, unchecked_hash)
+        else:
+            # unsafe .py modules of the output tree only when asked, it's often the source tree as well
+            if bundle_py:
+                out_files += sorted(set(output_path.rglob("*.py")) - set(out_files))
+            build_bundle(output_path, out_files, bundle_path, bundle_entry, unchecked_hash)
+
+    # if asked to run a single file, reuse this interpreter and the code we already have
+    if run_file and input_path.is_file():
+        if code is None:
+            print(f"[WARNING] -> {input_path} is protected, nothing to run")
+        else:
+            run_code(code, out_file, entry_point)
+
+    # if asked to run a folder and have an entry point
+    elif run_file and entry_point:
+        run_entry_point(output_path, entry_point)
+
+    # keep the compiler alive and rebuild on changes
+    if watch:
+        watch_compiler(input_path, output_path, enforce, strict, exclude=watch_exclude, compile_one=compile_one)
+
 
 help_text = """
 Usage: python typy.py <file.typy> [OPTIONS]
+       python typy.py serve [--socket <path>]
 
 Positional Arguments:
     <file.typy>        Input file or folder to compile. Use 'root' to specify
                        the root directory explicitly.
+    serve              Start a compile server listening on a Unix domain socket.
 
 Options:
     --run                Compile and immediately run the file.
     --run-here <entry>   Compile and run a specific entry point within the file.
+                         For folders, use <module>:<function> or <module>.
                          Cannot be used with --run.
     
+    --check              Only look for provable type errors (literal values that
+                         don't match their declared types) in parallel over the
+                         tree. Writes no output, exits with 1 on errors.
+    --watch              Keep the compiler running and recompile changed, added
+                         or removed .typy files. Cannot be used with --run.
+                         Hidden folders, __pycache__, node_modules and
+                         site-packages are never watched. A file that wasn't
+                         changed recently and is saved in place may take up to
+                         a second to be picked up.
+    --watch-exclude <name>
+                         Folder name or path the watcher skips as well. Can be
+                         given more than once. Requires --watch.
+
+    --client             Compile through a running compile server. Falls back to
+                         compiling in process when no server is running.
+    --socket <path>      Socket of the compile server, in a folder owned by you.
+                         Defaults to typy.sock in $XDG_RUNTIME_DIR, or in a
+                         private typy-<uid> folder of the temp directory.
+
+    --metrics <out.json> Write per file and whole build timings and counters as JSON.
+                         'checks' counts the enforced values: every typed
+                         argument and return value, and every typed variable.
+
+    --build <app.pyz>    Byte-compile the outputs in parallel and pack the .pyc
+                         files into a single archive. Run it with the same
+                         Python version that built it.
+    --build-entry <entry>
+                         Entry point of the archive, <module>:<function> or
+                         <module>. Requires --build.
+    --unchecked-hash     Use unchecked hash based .pyc files. Requires --build.
+    --build-with-py      Also bundle the plain .py modules found in the output
+                         folder, not only the ones compiled by this build.
+                         Requires --build.
+
     --enforce            Enable type enforcement during compilation.
     --enforce-strict     Strict type enforcement. Automatically enables --enforce.
                          Cannot be used with --enforce.
+    --enforce-shallow    Only check the outer type of record fields (dataclass,
+                         TypedDict, NamedTuple), not nested values. Automatically
+                         enables --enforce, can be combined with --enforce-strict.
+                         Cannot be used with --enforce.
     
     --no-debug           Disable debug output.
     --debug-all          Enable verbose debug output. Cannot be used with --no-debug.
@@ -707,6 +2125,23 @@ Examples:
     
     python compiler.py main.typy --run-here main_function
         Compile 'main.typy' and run 'main_function' as the entry point.
+
+    python compiler.py src --run-here app.main:main
+        Compile the 'src' folder and run 'main' from 'src/app/main.py'.
+
+    python compiler.py src --check
+        Check the 'src' folder for type errors without compiling it.
+
+    python compiler.py src --watch
+        Compile the 'src' folder and recompile it on every change.
+
+    python compiler.py serve
+        Start a compile server, then compile with:
+    python compiler.py main.typy --client
+
+    python compiler.py src --build app.pyz --build-entry app.main:main
+        Compile the 'src' folder and pack it into 'app.pyz', run with
+        'python app.pyz'.
 """
 
 if __name__ == "__main__":
@@ -764,6 +2199,101 @@ if __name__ == "__main__":
                 entry_point = None
     else: entry_point = None
 
+    # catch watch mode
+    if "--watch" in args:
+        watch = True
+        args.remove("--watch")
+    else: watch = False
+
+    # catch folders the watcher skips
+    watch_exclude = []
+    while "--watch-exclude" in args:
+        i = args.index("--watch-exclude")
+        if i + 1 >= len(args):
+            raise ValueError("--watch-exclude expects a folder")
+        watch_exclude.append(str(Path(args[i + 1]).resolve()) if os.sep in args[i + 1] else args[i + 1])
+        del args[i:i + 2]
+
+    # enforce arg safety
+    if watch_exclude and not watch:
+        raise ValueError("--watch-exclude requires --watch")
+    if watch and run_file:
+        raise ValueError("--watch cannot be used with --run or --run-here")
+
+    # catch client mode
+    if "--client" in args:
+        use_client = True
+        args.remove("--client")
+    else: use_client = False
+
+    # catch specified socket if any provided
+    if "--socket" in args:
+        i = args.index("--socket")
+        if i + 1 >= len(args):
+            raise ValueError("--socket expects a path")
+        socket_path = args[i + 1]
+        del args[i:i + 2]
+    else: socket_path = default_socket
+
+    # enforce arg safety
+    if use_client and input_file == "serve":
+        raise ValueError("--client cannot be used with serve")
+
+    # catch metrics report
+    if "--metrics" in args:
+        i = args.index("--metrics")
+        if i + 1 >= len(args):
+            raise ValueError("--metrics expects a path")
+        metrics_path = args[i + 1]
+        del args[i:i + 2]
+    else: metrics_path = None
+
+    # catch production build
+    if "--build" in args:
+        i = args.index("--build")
+        if i + 1 >= len(args):
+            raise ValueError("--build expects a path")
+        bundle_path = args[i + 1]
+        del args[i:i + 2]
+    else: bundle_path = None
+
+    # catch the archive entry point
+    if "--build-entry" in args:
+        i = args.index("--build-entry")
+        if i + 1 >= len(args):
+            raise ValueError("--build-entry expects an entry point")
+        bundle_entry = args[i + 1]
+        del args[i:i + 2]
+    else: bundle_entry = None
+
+    # catch unchecked hash pycs
+    if "--unchecked-hash" in args:
+        unchecked_hash = True
+        args.remove("--unchecked-hash")
+    else: unchecked_hash = False
+
+    # catch plain .py modules in the bundle
+    if "--build-with-py" in args:
+        bundle_py = True
+        args.remove("--build-with-py")
+    else: bundle_py = False
+
+    # enforce arg safety
+    if (bundle_entry or unchecked_hash or bundle_py) and not bundle_path:
+        raise ValueError("--build-entry, --unchecked-hash and --build-with-py require --build")
+    if bundle_path and watch:
+        raise ValueError("--build cannot be used with --watch")
+
+    # catch check mode
+    if "--check" in args:
+        check = True
+        args.remove("--check")
+    else: check = False
+
+    # enforce arg safety
+    if check and (run_file or watch or use_client or metrics_path or bundle_path):
+        raise ValueError("--check cannot be used with --run, --run-here, --watch, --client, --metrics or --build")
+
     # catch enforce mode
     if "--enforce" in args:
         enforce = True
@@ -776,12 +2306,24 @@ if __name__ == "__main__":
         args.remove("--enforce-strict")
     else: strict = False
 
+    # catch shallow mode
+    if "--enforce-shallow" in args:
+        shallow = True
+        args.remove("--enforce-shallow")
+    else: shallow = False
+
+    # enforce arg safety
+    if shallow and enforce:
+        raise ValueError("--enforce-shallow cannot be used with --enforce")
+
     # enforce arg safety
     if strict:
         if enforce:
             raise ValueError("--enforce--strict cannot be used with --enforce")
         else:
             enforce = True
+    if shallow:
+        enforce = True
 
     # catch skip debug
     if "--no-debug" in args:
@@ -806,14 +2348,29 @@ if __name__ == "__main__":
     if len(args) > 0:
         raise TypeError(f"[FATAL] Received unknown arguments: {args}")
 
+    # serve instead of compiling
+    if input_file == "serve":
+        start_server(socket_path)
+        sys.exit(0)
+
     print(f"│─ [INPUT] -> {input_file if input_file != " " else "root"}")
     print(f"│─ [OUTPUT] -> {output_file if output_file != " " else "root"}")
     print(f"│─ [WILL RUN] -> {run_file}")
     print(f"│─ [ENTRY POINT] -> {entry_point if run_file else "N/A"}")
     print(f"│─ [ENFORCE] -> {enforce}")
     print(f"│─ [STRICT] -> {strict}")
+    print(f"│─ [SHALLOW] -> {shallow}")
+    print(f"│─ [WATCH] -> {watch}")
+    print(f"│─ [SERVER] -> {socket_path if use_client else "N/A"}")
+    print(f"│─ [METRICS] -> {metrics_path if metrics_path else "N/A"}")
+    print(f"│─ [BUILD] -> {bundle_path if bundle_path else "N/A"}")
+    print(f"│─ [CHECK ONLY] -> {check}")
     print(f"└─ [DEBUG LEVEL] -> {debug_all + debug}")
     print()
 
     # start main loop
-    start_compiler(input_file, output_file, enforce, strict)
+    start_compiler(input_file, output_file, enforce, strict, watch=watch,
+                   socket_path=socket_path if use_client else None, metrics_path=metrics_path,
+                   bundle_path=bundle_path, bundle_entry=bundle_entry, unchecked_hash=unchecked_hash,
+                   check=check, watch_exclude=tuple(watch_exclude),
+                   bundle_py=bundle_py, shallow=shallow)